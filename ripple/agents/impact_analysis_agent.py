@@ -38,7 +38,8 @@ class ImpactAnalysisAgent:
             config['api_key'],
             config['endpoint_url'],
             config['model_name'],
-            max_tokens=analysis_config.get('max_tokens', 512)
+            max_tokens=analysis_config.get('max_tokens', 512),
+            cache_dir=config.get('llm_cache_dir')
         )
         
         # Initialize enhanced tools
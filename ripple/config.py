@@ -14,6 +14,8 @@ from typing import List, Dict
 NAI_ENDPOINT_API_KEY = os.getenv("NAI_API_KEY")
 NAI_LLM_ENDPOINT_URL = os.getenv("NAI_LLM_ENDPOINT_URL", "https://10.35.30.155/api/v1/chat/completions")
 NAI_LLM_ENDPOINT_NAME = os.getenv("NAI_LLM_MODEL", "pg-llama-33")
+# Optional directory for caching LLM responses across runs (unset = no caching)
+NAI_CACHE_DIR = os.getenv("NAI_CACHE_DIR")
 
 # GitHub Configuration
 # IMPORTANT: Set GITHUB_TOKEN environment variable before running
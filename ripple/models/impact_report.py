@@ -1,8 +1,34 @@
 """Impact analysis report models"""
+import heapq
+from functools import cached_property
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, FrozenSet, Optional, Union
 from datetime import datetime
 
+@dataclass(frozen=True)
+class TestStep:
+    """Single step of a generated user flow test plan"""
+    phase: str
+    step_num: int
+    action: str
+    details: str
+    validation: str
+    expected_result: str
+    impacted: bool = False
+    component: str = 'N/A'
+    repository: str = 'N/A'
+
+@dataclass(frozen=True)
+class FailureScenario:
+    """Potential failure mode of an impacted user flow"""
+    step: Union[int, str]
+    action: str
+    failure_type: str
+    description: str
+    impact: str
+    symptom: str
+    severity: str
+
 @dataclass
 class UserFlowImpact:
     """Impact on a specific user workflow"""
@@ -12,10 +38,15 @@ class UserFlowImpact:
     ui_path: str
     impacted_steps: List[Dict]
     all_steps: List[Dict]
-    test_steps: List[Dict]
-    failure_scenarios: List[Dict]
+    test_steps: List[TestStep]
+    failure_scenarios: List[FailureScenario]
     severity: str
     api_endpoints: List[str]
+    
+    @cached_property
+    def impacted_step_ids(self) -> FrozenSet[int]:
+        """Step numbers of the impacted steps, built once per flow"""
+        return frozenset(s['step'] for s in self.impacted_steps)
 
 @dataclass
 class ImpactScore:
@@ -71,6 +102,10 @@ class ImpactReport:
         """Get tests sorted by priority"""
         return sorted(self.generated_tests, key=lambda t: t.priority, reverse=True)
     
+    def get_top_tests(self, n: int) -> List[TestCase]:
+        """Get the n highest-priority tests, same order as get_prioritized_tests()[:n]"""
+        return heapq.nlargest(n, self.generated_tests, key=lambda t: t.priority)
+    
     def get_all_affected_flows(self) -> List[UserFlowImpact]:
         """Get all affected user flows across all impacted repos"""
         flows = []
@@ -78,10 +113,10 @@ class ImpactReport:
             flows.extend(score.user_flows)
         return flows
     
-    def get_critical_failure_scenarios(self) -> List[Dict]:
+    def get_critical_failure_scenarios(self) -> List[FailureScenario]:
         """Get all critical failure scenarios"""
         scenarios = []
         for flow in self.get_all_affected_flows():
-            scenarios.extend([s for s in flow.failure_scenarios if s['severity'] == 'critical'])
+            scenarios.extend([s for s in flow.failure_scenarios if s.severity == 'critical'])
         return scenarios
 
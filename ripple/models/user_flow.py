@@ -0,0 +1,47 @@
+"""Read-only user flow and deployment configuration records"""
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Tuple
+
+@dataclass(frozen=True)
+class UserFlow:
+    """User-triggered workflow, frozen from a user_flows config entry"""
+    flow_id: str
+    name: str
+    description: str
+    steps: Tuple[Dict, ...]
+    affected_by_repos: FrozenSet[str]
+    api_endpoints: Tuple[str, ...]
+    ui_path: str
+
+    @classmethod
+    def from_config(cls, flow_id: str, flow: Dict) -> 'UserFlow':
+        """Build a record from a user_flows entry"""
+        return cls(
+            flow_id=flow_id,
+            name=flow['name'],
+            description=flow['description'],
+            steps=tuple(flow['steps']),
+            affected_by_repos=frozenset(flow['affected_by_repos']),
+            api_endpoints=tuple(flow['api_endpoints']),
+            ui_path=flow['ui_path']
+        )
+
+@dataclass(frozen=True)
+class DeploymentEntry:
+    """Deployment settings of one repository, frozen from deployment_config"""
+    depends_on: Tuple[str, ...]
+    deployment_order: int
+    deployment_method: str
+    restart_required: Tuple[str, ...]
+    config_files: Tuple[str, ...]
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'DeploymentEntry':
+        """Build a record from a deployment_config entry"""
+        return cls(
+            depends_on=tuple(config['depends_on']),
+            deployment_order=config['deployment_order'],
+            deployment_method=config['deployment_method'],
+            restart_required=tuple(config['restart_required']),
+            config_files=tuple(config['config_files'])
+        )
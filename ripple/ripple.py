@@ -36,6 +36,7 @@ from config import (
     NAI_ENDPOINT_API_KEY,
     NAI_LLM_ENDPOINT_URL,
     NAI_LLM_ENDPOINT_NAME,
+    NAI_CACHE_DIR,
     GITHUB_TOKEN,
     NUTANIX_REPOSITORIES,
     TOOL_DEFINITIONS,
@@ -62,6 +63,7 @@ class MultiRepoImpactAnalyzer:
             'api_key': NAI_ENDPOINT_API_KEY,
             'endpoint_url': NAI_LLM_ENDPOINT_URL,
             'model_name': NAI_LLM_ENDPOINT_NAME,
+            'llm_cache_dir': NAI_CACHE_DIR,
             'github_token': GITHUB_TOKEN,
             'tool_definitions': TOOL_DEFINITIONS,
             'analysis_config': ANALYSIS_CONFIG,
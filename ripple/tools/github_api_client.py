@@ -2,9 +2,11 @@
 Enhanced GitHub API Client
 Follows Single Responsibility Principle: Only handles GitHub API interactions
 """
+import orjson
 import requests
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
+from itertools import chain
 import time
 
 
@@ -32,9 +34,9 @@ class GitHubAPIClient:
             "Accept": "application/vnd.github.v3+json"
         })
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Any:
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """
-        Make an API request with error handling and rate limiting.
+        Send an API request with error handling and rate limiting.
         
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -42,7 +44,7 @@ class GitHubAPIClient:
             **kwargs: Additional request parameters
             
         Returns:
-            Response JSON data
+            Raw response (for callers that need headers such as Link)
         """
         url = f"{self.BASE_URL}{endpoint}"
         
@@ -56,10 +58,10 @@ class GitHubAPIClient:
                     wait_time = reset_time - int(time.time()) + 1
                     print(f"⏳ Rate limit reached. Waiting {wait_time}s...")
                     time.sleep(wait_time)
-                    return self._make_request(method, endpoint, **kwargs)
+                    return self._send(method, endpoint, **kwargs)
             
             response.raise_for_status()
-            return response.json()
+            return response
             
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -69,6 +71,20 @@ class GitHubAPIClient:
             else:
                 raise Exception(f"GitHub API error: {e}")
     
+    def _make_request(self, method: str, endpoint: str, **kwargs) -> Any:
+        """
+        Make an API request with error handling and rate limiting.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            **kwargs: Additional request parameters
+            
+        Returns:
+            Response JSON data
+        """
+        return orjson.loads(self._send(method, endpoint, **kwargs).content)
+    
     def get_repository_info(self, owner: str, repo: str) -> Dict:
         """
         Get repository information.
@@ -108,25 +124,26 @@ class GitHubAPIClient:
         if until:
             params["until"] = until.isoformat()
         
-        commits = []
+        pages = []
         page = 1
         
         while True:
             params["page"] = page
             try:
-                page_commits = self._make_request(
+                response = self._send(
                     "GET", 
                     f"/repos/{owner}/{repo}/commits",
                     params=params
                 )
+                page_commits = orjson.loads(response.content)
                 
                 if not page_commits:
                     break
                 
-                commits.extend(page_commits)
+                pages.append(page_commits)
                 
-                # GitHub limits to 100 per page, stop if we get less
-                if len(page_commits) < 100:
+                # GitHub only sends a "next" link when another page exists
+                if 'next' not in response.links:
                     break
                 
                 page += 1
@@ -135,7 +152,7 @@ class GitHubAPIClient:
                 print(f"⚠️  Warning: Could not fetch page {page}: {e}")
                 break
         
-        return commits
+        return list(chain.from_iterable(pages))
     
     def get_commit_details(self, owner: str, repo: str, sha: str) -> Dict:
         """
@@ -330,9 +347,18 @@ class CommitFilter:
         Returns:
             Commits by the specified author
         """
-        return [
-            c for c in commits 
-            if c.get('commit', {}).get('author', {}).get('name') == author or
-               c.get('commit', {}).get('author', {}).get('email') == author
-        ]
+        return [c for c in commits if CommitFilter._author_matches(c, author)]
+    
+    @staticmethod
+    def _author_matches(commit: Dict, author: str) -> bool:
+        """Check commit author name/email without allocating default dicts"""
+        commit_data = commit.get('commit')
+        if not commit_data:
+            return False
+        
+        commit_author = commit_data.get('author')
+        if not commit_author:
+            return False
+        
+        return commit_author.get('name') == author or commit_author.get('email') == author
 
@@ -9,7 +9,6 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from github import Github
 import git
-import os
 
 from .github_api_client import GitHubAPIClient, RepositoryParser
 
@@ -88,25 +87,26 @@ class GitHubTools:
         Returns:
             Git repository object
         """
-        if os.path.exists(local_path):
-            try:
-                repo = git.Repo(local_path)
-                origin = repo.remotes.origin
-                origin.fetch()
-                
-                # Try to pull from current branch
-                try:
-                    origin.pull()
-                except Exception as e:
-                    print(f"   ℹ️  Could not pull latest changes: {e}")
-                
-                return repo
-            except Exception as e:
-                print(f"   ⚠️  Warning: Could not update repo: {e}")
-                return git.Repo(local_path)
-        else:
+        # Opening the repo answers "does it exist?" in one filesystem pass
+        try:
+            repo = git.Repo(local_path, search_parent_directories=False)
+        except (git.InvalidGitRepositoryError, git.NoSuchPathError):
             print(f"   📥 Cloning repository...")
             return git.Repo.clone_from(repo_url, local_path)
+        
+        try:
+            origin = repo.remotes.origin
+            origin.fetch()
+            
+            # Try to pull from current branch
+            try:
+                origin.pull()
+            except Exception as e:
+                print(f"   ℹ️  Could not pull latest changes: {e}")
+        except Exception as e:
+            print(f"   ⚠️  Warning: Could not update repo: {e}")
+        
+        return repo
     
     def get_commit_diff(self, repo_path: str, commit_hash: str) -> Dict:
         """
@@ -132,12 +132,21 @@ class GitHubTools:
         
         for diff in diffs:
             file_path = diff.a_path or diff.b_path
+            # Read the patch once and count on the raw bytes
+            patch = diff.diff
+            if patch:
+                additions = patch.count(b'\n+')
+                deletions = patch.count(b'\n-')
+                preview = patch[:1000].decode('utf-8', errors='replace')  # Increased limit
+            else:
+                additions = deletions = 0
+                preview = ""
             changes.append({
                 "file": file_path,
                 "change_type": diff.change_type,
-                "additions": str(diff.diff).count('\n+') if diff.diff else 0,
-                "deletions": str(diff.diff).count('\n-') if diff.diff else 0,
-                "diff": str(diff.diff)[:1000] if diff.diff else ""  # Increased limit
+                "additions": additions,
+                "deletions": deletions,
+                "diff": preview
             })
         
         return {
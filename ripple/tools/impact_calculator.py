@@ -3,10 +3,19 @@ Enhanced impact calculator with call graph analysis.
 
 Follows SOLID Principles.
 """
-from typing import List, Dict, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from .call_graph_analyzer import CallGraphAnalyzer
 
 
+def _build_analyzer(repo_path: str, changed_files: List[str]) -> CallGraphAnalyzer:
+    """Build a call graph in a worker process (module-level so it pickles)"""
+    analyzer = CallGraphAnalyzer()
+    analyzer.build_call_graph(repo_path, changed_files)
+    return analyzer
+
+
 class ImpactCalculator:
     """
     Calculate impact scores for code changes using call graph analysis.
@@ -14,6 +23,17 @@ class ImpactCalculator:
     Single Responsibility: Impact scoring
     """
     
+    # Base weight per change type (unknown types fall back to 0.5)
+    _CHANGE_WEIGHTS = {
+        "breaking": 1.0,
+        "enhancement": 0.6,
+        "bugfix": 0.4,
+        "refactor": 0.3
+    }
+    
+    # Baseline testing effort for each affected repository
+    BASE_HOURS_PER_REPO = 4.0
+    
     def __init__(self, dependency_graph, enable_call_graph: bool = True):
         """
         Initialize impact calculator.
@@ -47,6 +67,45 @@ class ImpactCalculator:
         self.call_graph_analyzers[repo_name] = analyzer
         return analyzer
     
+    def build_call_graphs_parallel(self, repo_specs: List[Tuple[str, str, List[str]]],
+                                   use_processes: bool = False,
+                                   max_workers: Optional[int] = None) -> Dict[str, CallGraphAnalyzer]:
+        """
+        Build call graphs for several repositories concurrently.
+        
+        Threads overlap the file reads of each repository walk; processes
+        also parallelize the AST construction, which holds the GIL, and are
+        the better fit for large repositories.
+        
+        Args:
+            repo_specs: List of (repo_name, repo_path, changed_files) tuples
+            use_processes: Use a process pool instead of a thread pool
+            max_workers: Worker count (default: CPU count)
+            
+        Returns:
+            Dict of repo_name -> CallGraphAnalyzer for the repos built
+        """
+        if not self.enable_call_graph or not repo_specs:
+            return {}
+        
+        max_workers = max_workers or os.cpu_count()
+        
+        if use_processes:
+            names = [name for name, _, _ in repo_specs]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                analyzers = executor.map(
+                    _build_analyzer,
+                    [path for _, path, _ in repo_specs],
+                    [files for _, _, files in repo_specs]
+                )
+                built = dict(zip(names, analyzers))
+            self.call_graph_analyzers.update(built)
+            return built
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            analyzers = executor.map(lambda spec: self.build_call_graph(*spec), repo_specs)
+            return {name: analyzer for (name, _, _), analyzer in zip(repo_specs, analyzers)}
+    
     def calculate_repo_impact(self, source_repo: str, 
                              changed_components: List[str],
                              change_type: str,
@@ -67,14 +126,7 @@ class ImpactCalculator:
         """
         dependents = self.dependency_graph.get_dependents(source_repo)
         
-        change_weights = {
-            "breaking": 1.0,
-            "enhancement": 0.6,
-            "bugfix": 0.4,
-            "refactor": 0.3
-        }
-        
-        base_weight = change_weights.get(change_type, 0.5)
+        base_weight = self._CHANGE_WEIGHTS.get(change_type, 0.5)
         impact_scores = {}
         
         # Get call graph analysis if available
@@ -190,12 +242,11 @@ class ImpactCalculator:
         Returns:
             Estimated hours
         """
-        base_hours_per_repo = 4.0
         total_hours = 0.0
         
         for repo in affected_repos:
             score = impact_scores.get(repo, 0.5)
-            repo_hours = base_hours_per_repo * (1 + score)
+            repo_hours = self.BASE_HOURS_PER_REPO * (1 + score)
             
             # Add time for impacted functions if we have call graph data
             if call_graph_data and repo in call_graph_data:
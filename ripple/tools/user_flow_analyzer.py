@@ -1,179 +1,324 @@
 """
 Tools for analyzing user flow impacts
 """
-from typing import List, Dict, Set
+import re
+from collections import defaultdict
+from typing import List, Dict, FrozenSet, Iterable, Iterator, Optional, Set, Tuple
+
+from models.impact_report import TestStep, FailureScenario
+from models.user_flow import UserFlow, DeploymentEntry
+
+# File path fragments that indicate API or UI code
+_USER_IMPACT_RE = re.compile(
+    r'/api/|/ui/|/rest/|/v1/|/v2/|endpoint|handler|controller|view',
+    re.IGNORECASE
+)
+
+# Severity levels shared by flow severity and failure scenarios
+_SEV_CRITICAL = 'critical'
+_SEV_HIGH = 'high'
+_SEV_MEDIUM = 'medium'
+_SEV_LOW = 'low'
 
 class UserFlowAnalyzer:
     """Analyze impacts on user-triggered workflows"""
     
-    def __init__(self, user_flows: Dict, deployment_config: Dict):
+    AFFECTED_CACHE_SIZE = 512
+    
+    def __init__(self, user_flows: Dict, deployment_config: Dict,
+                 user_facing_repos: Optional[Iterable[str]] = None):
         self.user_flows = user_flows
         self.deployment_config = deployment_config
+        self._user_facing: FrozenSet[str] = frozenset(user_facing_repos or ())
+        
+        # Inputs are read-only after construction; freeze them into records once
+        self._flows: Tuple[UserFlow, ...] = tuple(
+            UserFlow.from_config(flow_id, flow) for flow_id, flow in user_flows.items()
+        )
+        self._deployments: Dict[str, DeploymentEntry] = {
+            repo: DeploymentEntry.from_config(config) for repo, config in deployment_config.items()
+        }
+        
+        # Inverted indexes (by flow position) so queries only visit flows touching a repository
+        self._flows_by_repo: Dict[str, List[int]] = defaultdict(list)
+        self._steps_by_flow_repo: Dict[Tuple[int, Optional[str]], List[Dict]] = defaultdict(list)
+        self._components_by_flow_repo: Dict[Tuple[int, Optional[str]], Set[str]] = defaultdict(set)
+        
+        for index, flow in enumerate(self._flows):
+            for repo in flow.affected_by_repos:
+                self._flows_by_repo[repo].append(index)
+            
+            for step in flow.steps:
+                key = (index, step.get('repository'))
+                self._steps_by_flow_repo[key].append(step)
+                self._components_by_flow_repo[key].add(step.get('component', ''))
+        
+        # repo -> repos that depend on it; built on first deployment query
+        self._reverse_deps: Optional[Dict[str, List[str]]] = None
+        
+        # (repository, changed components, exact) -> (flow index, impacted steps) per affected flow
+        self._affected_cache: Dict[Tuple[str, FrozenSet[str], bool], Tuple[Tuple[int, Tuple[Dict, ...]], ...]] = {}
+        
+        # repository -> shared Setup step; TestStep is frozen so reuse is safe
+        self._setup_steps: Dict[str, TestStep] = {}
     
-    def find_affected_flows(self, repository: str, changed_components: List[str]) -> List[Dict]:
-        """Find all user flows affected by changes in a repository"""
-        affected_flows = []
+    def find_affected_flows(self, repository: str, changed_components: List[str],
+                            exact: bool = False) -> List[Dict]:
+        """
+        Find all user flows affected by changes in a repository.
+        
+        A step is hit when a changed component is a substring of its component
+        name, or equal to it when exact=True (pure set lookups).
+        """
+        affected_flows: List[Dict] = []
         
-        for flow_id, flow in self.user_flows.items():
-            if repository not in flow['affected_by_repos']:
-                continue
+        for index, impacted in self._find_affected(repository, frozenset(changed_components), exact):
+            flow = self._flows[index]
+            impacted_steps: List[Dict] = list(impacted)
+            severity = self._calculate_flow_severity(flow, impacted_steps)
+            affected_flows.append(self._flow_record(flow, impacted_steps, severity))
+        
+        return affected_flows
+    
+    def find_affected_flows_batch(self, repositories: List[str],
+                                  changed_components_per_repo: List[List[str]],
+                                  exact: bool = False) -> List[List[Dict]]:
+        """
+        Find affected flows for many repositories, scoring severity in one vectorized pass.
+        
+        Args:
+            repositories: Repository names to query
+            changed_components_per_repo: Changed components for each repository, in the same order
+            exact: Match component names exactly instead of by substring
             
-            # Check if any step involves the changed components
-            impacted_steps = []
-            for step in flow['steps']:
-                if step['repository'] == repository:
-                    # Check if component is affected
-                    if any(comp in step.get('component', '') for comp in changed_components):
-                        impacted_steps.append(step)
-                    # Or if no specific component match, include if repo matches
-                    elif not changed_components:
-                        impacted_steps.append(step)
+        Returns:
+            One list of affected flows per repository, same shape as find_affected_flows
+        """
+        import numpy as np
+        
+        hits = [
+            self._find_affected(repository, frozenset(changed), exact)
+            for repository, changed in zip(repositories, changed_components_per_repo)
+        ]
+        count = sum(len(repo_hits) for repo_hits in hits)
+        
+        totals = np.fromiter(
+            (len(self._flows[index].steps) for repo_hits in hits for index, _ in repo_hits),
+            dtype=np.int32, count=count
+        )
+        impacted = np.fromiter(
+            (len(steps) for repo_hits in hits for _, steps in repo_hits),
+            dtype=np.int32, count=count
+        )
+        
+        # 0/1/2 -> low/medium/high, same thresholds as _calculate_flow_severity
+        quads = impacted << 2
+        levels = (quads > totals << 1).astype(np.int8) + (quads > totals).astype(np.int8)
+        names = (_SEV_LOW, _SEV_MEDIUM, _SEV_HIGH)
+        severities = [names[level] for level in levels.tolist()]
+        
+        results: List[List[Dict]] = []
+        position = 0
+        for repo_hits in hits:
+            affected_flows: List[Dict] = []
+            for index, steps in repo_hits:
+                affected_flows.append(self._flow_record(self._flows[index], list(steps), severities[position]))
+                position += 1
+            results.append(affected_flows)
+        
+        return results
+    
+    def _flow_record(self, flow: UserFlow, impacted_steps: List[Dict], severity: str) -> Dict:
+        """Build the affected-flow dict returned to callers"""
+        return {
+            'flow_id': flow.flow_id,
+            'flow_name': flow.name,
+            'description': flow.description,
+            'impacted_steps': impacted_steps if impacted_steps else list(flow.steps),
+            'all_steps': list(flow.steps),
+            'api_endpoints': list(flow.api_endpoints),
+            'ui_path': flow.ui_path,
+            'severity': severity
+        }
+    
+    def _find_affected(self, repository: str, changed: FrozenSet[str],
+                       exact: bool) -> Tuple[Tuple[int, Tuple[Dict, ...]], ...]:
+        """Resolve affected flow ids and their impacted steps, memoized per query"""
+        cache_key = (repository, changed, exact)
+        cached = self._affected_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        hits: List[Tuple[int, Tuple[Dict, ...]]] = []
+        for index in self._flows_by_repo.get(repository, ()):
+            key = (index, repository)
+            repo_steps = self._steps_by_flow_repo.get(key, ())
             
-            if impacted_steps or not changed_components:
-                affected_flows.append({
-                    'flow_id': flow_id,
-                    'flow_name': flow['name'],
-                    'description': flow['description'],
-                    'impacted_steps': impacted_steps if impacted_steps else flow['steps'],
-                    'all_steps': flow['steps'],
-                    'api_endpoints': flow['api_endpoints'],
-                    'ui_path': flow['ui_path'],
-                    'severity': self._calculate_flow_severity(flow, impacted_steps)
-                })
+            if changed:
+                # Match each distinct component once, then pick its steps.
+                # Equal names are substrings too, so the set lookup short-circuits the scan
+                components = self._components_by_flow_repo.get(key, set())
+                hit_components: Set[str]
+                if exact:
+                    hit_components = components & changed
+                else:
+                    hit_components = {
+                        component for component in components
+                        if component in changed or any(comp in component for comp in changed)
+                    }
+                if not hit_components:
+                    continue
+                hits.append((index, tuple(
+                    step for step in repo_steps
+                    if step.get('component', '') in hit_components
+                )))
+            else:
+                # No specific component given - every step in the repo counts
+                hits.append((index, tuple(repo_steps)))
         
-        return affected_flows
+        result = tuple(hits)
+        if len(self._affected_cache) >= self.AFFECTED_CACHE_SIZE:
+            # Drop the oldest query; CI runs repeat the same few component sets
+            del self._affected_cache[next(iter(self._affected_cache))]
+        self._affected_cache[cache_key] = result
+        return result
     
-    def _calculate_flow_severity(self, flow: Dict, impacted_steps: List[Dict]) -> str:
+    def _calculate_flow_severity(self, flow: UserFlow, impacted_steps: List[Dict]) -> str:
         """Calculate severity of impact on user flow"""
         if not impacted_steps:
-            return "low"
+            return _SEV_LOW
         
-        total_steps = len(flow['steps'])
-        impacted_count = len(impacted_steps)
+        total_steps: int = len(flow.steps)
+        impacted_quads: int = len(impacted_steps) << 2
         
-        # If more than 50% steps impacted, it's high severity
-        if impacted_count / total_steps > 0.5:
-            return "high"
-        elif impacted_count / total_steps > 0.25:
-            return "medium"
+        # Compare 4*impacted against step counts to stay in integer math:
+        # more than 50% steps impacted is high, more than 25% is medium
+        if impacted_quads > total_steps << 1:
+            return _SEV_HIGH
+        elif impacted_quads > total_steps:
+            return _SEV_MEDIUM
         else:
-            return "low"
+            return _SEV_LOW
     
-    def generate_test_steps(self, affected_flow: Dict, repository: str) -> List[Dict]:
+    def generate_test_steps(self, affected_flow: Dict, repository: str) -> List[TestStep]:
         """Generate detailed test steps for affected flow"""
-        test_steps = []
-        
-        # Pre-requisites
-        test_steps.append({
-            'phase': 'Setup',
-            'step_num': 0,
-            'action': 'Setup test environment',
-            'details': f'Ensure {repository} is deployed with latest changes',
-            'validation': 'Verify all services are running',
-            'expected_result': 'System is healthy and ready'
-        })
+        return list(self.iter_test_steps(affected_flow, repository))
+    
+    def iter_test_steps(self, affected_flow: Dict, repository: str) -> Iterator[TestStep]:
+        """Yield test steps for affected flow: setup, one per flow step, then validation"""
+        all_steps: List[Dict] = affected_flow['all_steps']
+        impacted_ids: FrozenSet[int] = frozenset(s['step'] for s in affected_flow['impacted_steps'])
+        
+        # Pre-requisites (identical for every flow of a repository)
+        setup = self._setup_steps.get(repository)
+        if setup is None:
+            setup = TestStep(
+                phase='Setup',
+                step_num=0,
+                action='Setup test environment',
+                details=f'Ensure {repository} is deployed with latest changes',
+                validation='Verify all services are running',
+                expected_result='System is healthy and ready'
+            )
+            self._setup_steps[repository] = setup
+        yield setup
         
         # Test each step in the user flow
-        for i, step in enumerate(affected_flow['all_steps'], 1):
-            is_impacted = any(s['step'] == step['step'] for s in affected_flow['impacted_steps'])
+        for i, step in enumerate(all_steps, 1):
+            is_impacted = step['step'] in impacted_ids
             
-            test_steps.append({
-                'phase': 'Execution',
-                'step_num': i,
-                'action': step['action'],
-                'details': f"Test step: {step['action']}",
-                'validation': f"Verify {step['component']} responds correctly" if 'component' in step else "Verify operation completes",
-                'expected_result': 'Step completes without errors',
-                'impacted': is_impacted,
-                'component': step.get('component', 'N/A'),
-                'repository': step.get('repository', 'N/A')
-            })
+            yield TestStep(
+                phase='Execution',
+                step_num=i,
+                action=step['action'],
+                details=f"Test step: {step['action']}",
+                validation=f"Verify {step['component']} responds correctly" if 'component' in step else "Verify operation completes",
+                expected_result='Step completes without errors',
+                impacted=is_impacted,
+                component=step.get('component', 'N/A'),
+                repository=step.get('repository', 'N/A')
+            )
         
         # Post-validation
-        test_steps.append({
-            'phase': 'Validation',
-            'step_num': len(affected_flow['all_steps']) + 1,
-            'action': 'Verify end-to-end flow completion',
-            'details': f'Confirm {affected_flow["flow_name"]} completed successfully',
-            'validation': 'Check logs, UI state, and data consistency',
-            'expected_result': 'Flow completed with expected outcome'
-        })
-        
-        return test_steps
+        yield TestStep(
+            phase='Validation',
+            step_num=len(all_steps) + 1,
+            action='Verify end-to-end flow completion',
+            details=f'Confirm {affected_flow["flow_name"]} completed successfully',
+            validation='Check logs, UI state, and data consistency',
+            expected_result='Flow completed with expected outcome'
+        )
     
-    def identify_failure_scenarios(self, affected_flow: Dict, repository: str) -> List[Dict]:
+    def identify_failure_scenarios(self, affected_flow: Dict, repository: str) -> List[FailureScenario]:
         """Identify potential failure scenarios"""
-        scenarios = []
-        
+        return list(self.iter_failure_scenarios(affected_flow, repository))
+    
+    def iter_failure_scenarios(self, affected_flow: Dict, repository: str) -> Iterator[FailureScenario]:
+        """Yield failure scenarios per impacted step, then the whole-workflow failure"""
         for step in affected_flow['impacted_steps']:
-            scenarios.append({
-                'step': step['step'],
-                'action': step['action'],
-                'failure_type': 'API Failure',
-                'description': f"API call fails in {step.get('component', 'component')}",
-                'impact': f"User cannot proceed with {affected_flow['flow_name']}",
-                'symptom': 'Error message displayed in UI or API timeout',
-                'severity': 'high' if step['step'] < 3 else 'medium'
-            })
+            yield FailureScenario(
+                step=step['step'],
+                action=step['action'],
+                failure_type='API Failure',
+                description=f"API call fails in {step.get('component', 'component')}",
+                impact=f"User cannot proceed with {affected_flow['flow_name']}",
+                symptom='Error message displayed in UI or API timeout',
+                severity=_SEV_HIGH if step['step'] < 3 else _SEV_MEDIUM
+            )
             
-            scenarios.append({
-                'step': step['step'],
-                'action': step['action'],
-                'failure_type': 'Data Inconsistency',
-                'description': f"Incorrect data returned from {repository}",
-                'impact': f"User sees stale or incorrect information",
-                'symptom': 'UI displays wrong values or outdated status',
-                'severity': 'medium'
-            })
+            yield FailureScenario(
+                step=step['step'],
+                action=step['action'],
+                failure_type='Data Inconsistency',
+                description=f"Incorrect data returned from {repository}",
+                impact="User sees stale or incorrect information",
+                symptom='UI displays wrong values or outdated status',
+                severity=_SEV_MEDIUM
+            )
         
         # Add critical flow failure
-        scenarios.append({
-            'step': 'All',
-            'action': 'Complete workflow',
-            'failure_type': 'Workflow Failure',
-            'description': f"Changes in {repository} break the entire {affected_flow['flow_name']}",
-            'impact': 'Critical feature unavailable to users',
-            'symptom': f"Users cannot access {affected_flow['ui_path']}",
-            'severity': 'critical'
-        })
-        
-        return scenarios
+        yield FailureScenario(
+            step='All',
+            action='Complete workflow',
+            failure_type='Workflow Failure',
+            description=f"Changes in {repository} break the entire {affected_flow['flow_name']}",
+            impact='Critical feature unavailable to users',
+            symptom=f"Users cannot access {affected_flow['ui_path']}",
+            severity=_SEV_CRITICAL
+        )
     
     def check_deployment_impact(self, repository: str) -> Dict:
         """Check deployment configuration impact"""
-        if repository not in self.deployment_config:
+        entry = self._deployments.get(repository)
+        if entry is None:
             return {}
         
-        config = self.deployment_config[repository]
-        
         return {
-            'deployment_order': config['deployment_order'],
-            'depends_on': config['depends_on'],
-            'deployment_method': config['deployment_method'],
-            'services_to_restart': config['restart_required'],
-            'config_files': config['config_files'],
-            'dependent_repos': [
-                repo for repo, conf in self.deployment_config.items()
-                if repository in conf['depends_on']
-            ]
+            'deployment_order': entry.deployment_order,
+            'depends_on': list(entry.depends_on),
+            'deployment_method': entry.deployment_method,
+            'services_to_restart': list(entry.restart_required),
+            'config_files': list(entry.config_files),
+            'dependent_repos': list(self._get_reverse_deps().get(repository, ()))
         }
     
+    def _get_reverse_deps(self) -> Dict[str, List[str]]:
+        """Build the repo -> dependents index in one pass over deployment_config"""
+        if self._reverse_deps is None:
+            reverse_deps: Dict[str, List[str]] = defaultdict(list)
+            for repo, entry in self._deployments.items():
+                for dep in entry.depends_on:
+                    reverse_deps[dep].append(repo)
+            self._reverse_deps = dict(reverse_deps)
+        return self._reverse_deps
+    
     def is_user_impacting_change(self, repository: str, changed_files: List[str]) -> bool:
         """Determine if change impacts user-facing functionality"""
         # Check if repository is user-facing
-        for repo_config in [r for r in [] if r.get('name') == repository]:
-            if repo_config.get('user_facing', False):
-                return True
-        
-        # Check if any changed file is in API or UI paths
-        user_impacting_patterns = [
-            '/api/', '/ui/', '/rest/', '/v1/', '/v2/', 
-            'endpoint', 'handler', 'controller', 'view'
-        ]
-        
-        for file in changed_files:
-            if any(pattern in file.lower() for pattern in user_impacting_patterns):
-                return True
+        if repository in self._user_facing:
+            return True
         
-        return False
+        # Check if any changed file is in API or UI paths (one regex scan per file)
+        search = _USER_IMPACT_RE.search
+        return any(search(file) for file in changed_files)
 
@@ -2,15 +2,56 @@
 Dynamic configuration builder for user flows and dependencies
 Builds configuration based on repository metadata
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 
 class DynamicConfigBuilder:
     """Dynamically builds user flows and deployment config from repository metadata"""
     
+    # Layers with a fixed place in the deployment order
+    _KNOWN_LAYERS = ('api', 'core', 'testing')
+    
+    # Operation keyword -> UI path, checked in order (first match wins)
+    _UI_PATHS = (
+        ('inventory', "Prism UI -> Settings -> Upgrade Software -> Inventory"),
+        ('upgrade', "Prism UI -> Settings -> Upgrade Software -> Upgrade"),
+        ('status', "Prism UI -> Settings -> Upgrade Software -> Status"),
+    )
+    
+    # Lower-cased language -> deployment method; anything else ships as 'tar'
+    _DEPLOYMENT_METHODS = {
+        'python': 'rpm',  # Common for Nutanix Python services
+        'javascript': 'npm',
+        'typescript': 'npm',
+        'go': 'binary',
+    }
+    
     def __init__(self, repositories: List[Dict]):
         self.repositories = repositories
         self.repo_map = {repo['name']: repo for repo in repositories}
+        
+        # Partition repositories by deployment layer once
+        self._by_layer: Dict[Optional[str], List[Dict]] = {}
+        self._other_repos: List[Dict] = []
+        for repo in repositories:
+            layer = repo.get('deployment_layer')
+            self._by_layer.setdefault(layer, []).append(repo)
+            if layer not in self._KNOWN_LAYERS:
+                self._other_repos.append(repo)
+        
+        self._api_repos = self._by_layer.get('api', [])
+        self._core_repos = self._by_layer.get('core', [])
+        self._testing_repos = self._by_layer.get('testing', [])
+        self._api_names = [r['name'] for r in self._api_repos]
+        self._core_names = [r['name'] for r in self._core_repos]
+        
+        # Service inference depends only on the deployment layer
+        self._services_cache: Dict[Optional[str], List[str]] = {}
+        self._step_cache: Dict[Tuple[int, str, str, str], Dict] = {}
+        
+        # Repositories don't change after construction, so flows are built once
+        self._operation_groups: Optional[Dict[str, List[Dict]]] = None
+        self._user_flows_cache: Optional[Dict[str, Any]] = None
     
     def build_deployment_config(self) -> Dict[str, Any]:
         """
@@ -26,17 +67,13 @@ class DynamicConfigBuilder:
         - Modules depend on Core
         - Testing depends on what it tests
         """
-        deployment_config = {}
+        deployment_config: Dict[str, Any] = {}
         
-        # Group repos by deployment layer
-        api_repos = [r for r in self.repositories if r.get('deployment_layer') == 'api']
-        core_repos = [r for r in self.repositories if r.get('deployment_layer') == 'core']
-        testing_repos = [r for r in self.repositories if r.get('deployment_layer') == 'testing']
-        other_repos = [r for r in self.repositories 
-                      if r.get('deployment_layer') not in ['api', 'core', 'testing']]
+        api_repo_names = self._api_names
+        core_repo_names = self._core_names
         
         # API layer repos (no dependencies)
-        for repo in api_repos:
+        for repo in self._api_repos:
             deployment_config[repo['name']] = {
                 'depends_on': [],
                 'deployment_order': 1,
@@ -47,8 +84,7 @@ class DynamicConfigBuilder:
             }
         
         # Core repos (depend on API layer)
-        api_repo_names = [r['name'] for r in api_repos]
-        for repo in core_repos:
+        for repo in self._core_repos:
             deployment_config[repo['name']] = {
                 'depends_on': api_repo_names,
                 'deployment_order': 2,
@@ -59,8 +95,7 @@ class DynamicConfigBuilder:
             }
         
         # Module/Other repos (depend on core)
-        core_repo_names = [r['name'] for r in core_repos]
-        for repo in other_repos:
+        for repo in self._other_repos:
             deployment_config[repo['name']] = {
                 'depends_on': core_repo_names if core_repo_names else api_repo_names,
                 'deployment_order': 3,
@@ -71,7 +106,7 @@ class DynamicConfigBuilder:
             }
         
         # Testing repos (depend on what they test, usually core or modules)
-        for repo in testing_repos:
+        for repo in self._testing_repos:
             deployment_config[repo['name']] = {
                 'depends_on': core_repo_names if core_repo_names else [],
                 'deployment_order': 4,
@@ -93,18 +128,22 @@ class DynamicConfigBuilder:
         - Build flow steps based on deployment layers (API -> Core -> Modules)
         - Map UI endpoints to flows
         """
-        user_flows = {}
+        if self._user_flows_cache is not None:
+            return self._user_flows_cache
+        
+        user_flows: Dict[str, Any] = {}
         
         # Get user-facing repos
         user_facing_repos = [r for r in self.repositories if r.get('user_facing', False)]
         
         if not user_facing_repos:
             # No user flows if no user-facing repos
-            return {}
+            self._user_flows_cache = {}
+            return self._user_flows_cache
         
         # Find API and Core repos for flow construction
-        api_repos = [r for r in self.repositories if r.get('deployment_layer') == 'api']
-        core_repos = [r for r in self.repositories if r.get('deployment_layer') == 'core']
+        api_repos = self._api_repos
+        core_repos = self._core_repos
         
         # Build flows based on common operations
         operation_groups = self._group_operations_by_type()
@@ -117,7 +156,7 @@ class DynamicConfigBuilder:
             steps = self._build_flow_steps(operation_type, repos_with_op, api_repos, core_repos)
             
             # Collect affected repos and endpoints
-            affected_repos = list(set([r['name'] for r in repos_with_op]))
+            affected_repos = list(dict.fromkeys(r['name'] for r in repos_with_op))
             api_endpoints = self._collect_api_endpoints(repos_with_op)
             ui_path = self._infer_ui_path(operation_type, repos_with_op)
             
@@ -134,11 +173,15 @@ class DynamicConfigBuilder:
         if not user_flows:
             user_flows = self._create_generic_flows(user_facing_repos, api_repos, core_repos)
         
+        self._user_flows_cache = user_flows
         return user_flows
     
     def _group_operations_by_type(self) -> Dict[str, List[Dict]]:
         """Group repositories by operation types"""
-        operation_groups = {}
+        if self._operation_groups is not None:
+            return self._operation_groups
+        
+        operation_groups: Dict[str, List[Dict]] = {}
         
         for repo in self.repositories:
             operations = repo.get('operations', [])
@@ -151,6 +194,7 @@ class DynamicConfigBuilder:
                 
                 operation_groups[op_category].append(repo)
         
+        self._operation_groups = operation_groups
         return operation_groups
     
     def _build_flow_steps(self, operation_type: str, 
@@ -158,79 +202,82 @@ class DynamicConfigBuilder:
                          api_repos: List[Dict],
                          core_repos: List[Dict]) -> List[Dict]:
         """Build flow steps for an operation"""
-        steps = []
-        step_num = 1
+        steps: List[Dict] = []
+        step_num: int = 1
         
         # Step 1: User initiates via API (if API layer exists)
         if api_repos:
             api_repo = api_repos[0]
-            steps.append({
-                'step': step_num,
-                'action': f"User initiates {operation_type.replace('_', ' ')} via UI",
-                'repository': api_repo['name'],
-                'component': 'api_gateway'
-            })
+            steps.append(self._shared_step(
+                step_num, f"User initiates {operation_type.replace('_', ' ')} via UI",
+                api_repo['name'], 'api_gateway'
+            ))
             step_num += 1
             
             # Step 2: API authentication
             if 'authentication' in api_repo.get('components', []):
-                steps.append({
-                    'step': step_num,
-                    'action': "API authenticates and routes request",
-                    'repository': api_repo['name'],
-                    'component': 'authentication'
-                })
+                steps.append(self._shared_step(
+                    step_num, "API authenticates and routes request",
+                    api_repo['name'], 'authentication'
+                ))
                 step_num += 1
         
         # Step 3+: Core processing
         for core_repo in core_repos:
             if core_repo in repos_with_op:
+                # The operations check doesn't depend on the component
+                ops_prefix_hit: bool = any(op.startswith(operation_type)
+                                     for op in core_repo.get('operations', []))
                 for component in core_repo.get('components', []):
-                    if operation_type in component or any(op.startswith(operation_type) for op in core_repo.get('operations', [])):
-                        steps.append({
-                            'step': step_num,
-                            'action': f"System processes {operation_type.replace('_', ' ')} in {component}",
-                            'repository': core_repo['name'],
-                            'component': component
-                        })
+                    if ops_prefix_hit or operation_type in component:
+                        steps.append(self._shared_step(
+                            step_num, f"System processes {operation_type.replace('_', ' ')} in {component}",
+                            core_repo['name'], component
+                        ))
                         step_num += 1
         
         # Step final: API returns result
         if api_repos:
             api_repo = api_repos[0]
-            steps.append({
-                'step': step_num,
-                'action': f"API returns {operation_type.replace('_', ' ')} result to user",
-                'repository': api_repo['name'],
-                'component': 'rest_handlers'
-            })
+            steps.append(self._shared_step(
+                step_num, f"API returns {operation_type.replace('_', ' ')} result to user",
+                api_repo['name'], 'rest_handlers'
+            ))
         
         return steps
     
+    def _shared_step(self, step_num: int, action: str, repository: str, component: str) -> Dict:
+        """Return one step dict per distinct step; flows only read steps, so they share it"""
+        key = (step_num, action, repository, component)
+        step = self._step_cache.get(key)
+        if step is None:
+            step = {
+                'step': step_num,
+                'action': action,
+                'repository': repository,
+                'component': component
+            }
+            self._step_cache[key] = step
+        return step
+    
     def _collect_api_endpoints(self, repos: List[Dict]) -> List[str]:
-        """Collect all API endpoints from repositories"""
-        endpoints = []
-        for repo in repos:
-            endpoints.extend(repo.get('ui_endpoints', []))
-        return list(set(endpoints))
+        """Collect all API endpoints from repositories (deduplicated, in order)"""
+        return list(dict.fromkeys(
+            endpoint for repo in repos for endpoint in repo.get('ui_endpoints', [])
+        ))
     
     def _infer_ui_path(self, operation_type: str, repos: List[Dict]) -> str:
         """Infer UI path based on operation type"""
-        # Common patterns
-        if 'inventory' in operation_type:
-            return "Prism UI -> Settings -> Upgrade Software -> Inventory"
-        elif 'upgrade' in operation_type:
-            return "Prism UI -> Settings -> Upgrade Software -> Upgrade"
-        elif 'status' in operation_type:
-            return "Prism UI -> Settings -> Upgrade Software -> Status"
-        else:
-            return f"Prism UI -> {operation_type.replace('_', ' ').title()}"
+        for keyword, ui_path in self._UI_PATHS:
+            if keyword in operation_type:
+                return ui_path
+        return f"Prism UI -> {operation_type.replace('_', ' ').title()}"
     
     def _create_generic_flows(self, user_facing_repos: List[Dict],
                             api_repos: List[Dict],
                             core_repos: List[Dict]) -> Dict[str, Any]:
         """Create generic flows when no specific operations are defined"""
-        flows = {}
+        flows: Dict[str, Any] = {}
         
         # Generic data retrieval flow
         flows['generic_data_flow'] = {
@@ -260,29 +307,26 @@ class DynamicConfigBuilder:
     
     def _infer_deployment_method(self, repo: Dict) -> str:
         """Infer deployment method from repository metadata"""
-        language = repo.get('language', '').lower()
-        
-        if language == 'python':
-            return 'rpm'  # Common for Nutanix Python services
-        elif language in ['javascript', 'typescript']:
-            return 'npm'
-        elif language == 'go':
-            return 'binary'
-        else:
-            return 'tar'
+        return self._DEPLOYMENT_METHODS.get(repo.get('language', '').lower(), 'tar')
     
     def _infer_services(self, repo: Dict) -> List[str]:
         """Infer system services from repository metadata"""
-        services = []
+        layer = repo.get('deployment_layer')
+        cached = self._services_cache.get(layer)
+        if cached is not None:
+            return cached
+        
+        services: List[str] = []
         
         # API layer repos typically need nginx/api-gateway
-        if repo.get('deployment_layer') == 'api':
+        if layer == 'api':
             services.extend(['nginx', 'api-gateway'])
         
         # Core repos typically need genesis/ergon (Nutanix specific)
-        if repo.get('deployment_layer') == 'core':
+        if layer == 'core':
             services.extend(['genesis', 'ergon'])
         
+        self._services_cache[layer] = services
         return services
     
     def _infer_config_files(self, repo: Dict) -> List[str]:
@@ -297,11 +341,7 @@ class DynamicConfigBuilder:
     
     def _infer_restart_services(self, repo: Dict) -> List[str]:
         """Infer which services need restart after deployment"""
+        # Typically the first service needs restart (reuses the cached list)
         services = self._infer_services(repo)
-        
-        # Typically the first service needs restart
-        if services:
-            return [services[0]]
-        
-        return []
+        return [services[0]] if services else []
 
@@ -1,31 +1,98 @@
 """HTML report generator for impact analysis"""
-from typing import List
+import asyncio
+import gzip
+import os
+import re
+from html import escape
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional
 from models.impact_report import ImpactReport
 from datetime import datetime
 
+# {{NAME}} placeholders in the report template
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+_HIGH_RISK = frozenset({'high', 'critical'})
+
+_RISK_EMOJI = MappingProxyType({'low': '✅', 'medium': '⚠️', 'high': '🔶', 'critical': '🔴'})
+
+# Full risk badge text ("🔶 HIGH"), so the score loop does one lookup and no upper()
+_RISK_BADGE = MappingProxyType({level: f"{emoji} {level.upper()}" for level, emoji in _RISK_EMOJI.items()})
+
+# Priority -> star rating for the usual 0-10 range
+_STARS = MappingProxyType({priority: '⭐' * priority for priority in range(11)})
+
 class HTMLReportGenerator:
     """Generate beautiful HTML reports"""
     
-    def __init__(self, llm_model_name: str):
+    CSS_FILENAME = "ripple_report.css"
+    # Below this many reports, process start-up costs more than it saves
+    PARALLEL_MIN_REPORTS = 8
+    
+    def __init__(self, llm_model_name: str, external_css: bool = False, parallel: bool = False):
         self.llm_model_name = llm_model_name
+        # Template parts with the model name pre-filled; rebuilt if the name changes
+        self._bound_parts: List[str] = []
+        self._bound_model: Optional[str] = None
+        # Link a shared stylesheet next to the report instead of inlining it
+        self.external_css = external_css
+        # Render report sections in worker processes for large batches
+        self.parallel = parallel
     
-    def generate(self, reports: List[ImpactReport], output_path: str):
-        """Generate HTML report from multiple analysis reports"""
+    def generate(self, reports: List[ImpactReport], output_path: str, compress: bool = False):
+        """Generate HTML report from multiple analysis reports (gzipped if compress or *.gz)"""
         
-        # Summary statistics
         total_commits = len(reports)
-        total_affected_repos = len(set(
-            repo for r in reports for repo in r.affected_repositories
-        ))
-        total_tests = sum(len(r.generated_tests) for r in reports)
-        high_risk_count = sum(
-            1 for r in reports 
-            for s in r.impact_scores 
-            if s.risk_level in ['high', 'critical']
-        )
+        summary_html = self._generate_summary(reports)
+        
+        substitutions = {
+            "STYLES": self._styles_html(output_path),
+            "SUMMARY": summary_html,
+            "TIMESTAMP": datetime.now().isoformat(sep=' ', timespec='seconds'),
+            "TOTAL_COMMITS": str(total_commits),
+        }
+        
+        # Stream the pre-split template to the file; report sections are written
+        # as they are built so the whole document is never held in memory
+        if compress or output_path.endswith('.gz'):
+            output = gzip.open(output_path, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            output = open(output_path, 'w', encoding='utf-8', buffering=65536)
+        with output as f:
+            for i, part in enumerate(self._get_bound_parts()):
+                if not i % 2:
+                    f.write(part)
+                elif part == "REPORTS":
+                    for section in self._iter_report_sections(reports):
+                        f.write(section)
+                else:
+                    f.write(substitutions[part])
         
-        # Build summary section
-        summary_html = f"""
+        print(f"✅ HTML report generated: {output_path}")
+    
+    def _generate_summary(self, reports: List[ImpactReport]) -> str:
+        """Generate the summary cards; the no-reports version is built once per class"""
+        if not reports:
+            return self._get_class_cached('_empty_summary', lambda: self._summary_cards(0, 0, 0, 0))
+        
+        # Summary statistics, gathered in one pass over the reports
+        affected_repos = set()
+        total_tests = 0
+        high_risk_count = 0
+        for r in reports:
+            affected_repos.update(r.affected_repositories)
+            total_tests += len(r.generated_tests)
+            for s in r.impact_scores:
+                if s.risk_level in _HIGH_RISK:
+                    high_risk_count += 1
+        
+        return self._summary_cards(len(reports), len(affected_repos), total_tests, high_risk_count)
+    
+    def _summary_cards(self, total_commits: int, total_affected_repos: int,
+                       total_tests: int, high_risk_count: int) -> str:
+        """Render the four summary cards"""
+        return f"""
         <div class="summary-grid">
             <div class="summary-card">
                 <div class="summary-number">{total_commits}</div>
@@ -45,73 +112,103 @@ class HTMLReportGenerator:
             </div>
         </div>
         """
+    
+    async def generate_async(self, reports: List[ImpactReport], output_path: str,
+                             compress: bool = False):
+        """
+        Generate a report without blocking the event loop.
         
-        # Build detailed reports
-        reports_html = ""
-        for i, report in enumerate(reports, 1):
-            reports_html += self._generate_report_section(report, i)
-        
-        # Fill template
-        html = self._get_html_template()
-        html = html.replace("{{SUMMARY}}", summary_html)
-        html = html.replace("{{REPORTS}}", reports_html)
-        html = html.replace("{{TIMESTAMP}}", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        html = html.replace("{{LLM_MODEL}}", self.llm_model_name)
-        html = html.replace("{{TOTAL_COMMITS}}", str(total_commits))
+        Rendering and file writes run in the loop's default executor, so a batch
+        started with asyncio.gather overlaps one report's disk I/O with the next
+        report's rendering.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.generate, reports, output_path, compress)
+    
+    def _iter_report_sections(self, reports: List[ImpactReport]) -> Iterator[str]:
+        """Yield rendered report sections in order, from a process pool for large parallel batches"""
+        if self.parallel and len(reports) > self.PARALLEL_MIN_REPORTS:
+            with ProcessPoolExecutor() as executor:
+                yield from executor.map(self._generate_report_section, reports,
+                                        range(1, len(reports) + 1), chunksize=4)
+        else:
+            for index, report in enumerate(reports, 1):
+                yield self._generate_report_section(report, index)
+    
+    def _styles_html(self, output_path: str) -> str:
+        """Inline the stylesheet, or write it once beside the report and link it"""
+        if not self.external_css:
+            return self._get_class_cached('_inline_styles', lambda: f"<style>\n{self._get_css()}    </style>")
         
-        # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        css = self._get_css()
+        css_path = os.path.join(os.path.dirname(os.path.abspath(output_path)), self.CSS_FILENAME)
+        try:
+            with open(css_path, 'r', encoding='utf-8') as f:
+                up_to_date = f.read() == css
+        except OSError:
+            up_to_date = False
+        if not up_to_date:
+            with open(css_path, 'w', encoding='utf-8') as f:
+                f.write(css)
         
-        print(f"✅ HTML report generated: {output_path}")
+        return f'<link rel="stylesheet" href="{self.CSS_FILENAME}">'
     
     def _generate_report_section(self, report: ImpactReport, index: int) -> str:
         """Generate HTML for a single report"""
         
-        risk_emoji = {'low': '✅', 'medium': '⚠️', 'high': '🔶', 'critical': '🔴'}
-        
         # Impact scores HTML
-        impact_html = ""
         if report.impact_scores:
+            impact_parts = []
             for score in report.impact_scores:
-                impact_html += f"""
+                impact_parts.append(f"""
                 <div class="impact-item risk-{score.risk_level}">
                     <div class="impact-header">
-                        <span class="risk-badge">{risk_emoji[score.risk_level]} {score.risk_level.upper()}</span>
+                        <span class="risk-badge">{_RISK_BADGE[score.risk_level]}</span>
                         <span class="repo-name">{score.repository}</span>
                         <span class="impact-score">Impact: {score.score:.2f}</span>
                     </div>
-                    <div class="impact-detail">{score.reasoning}</div>
+                    <div class="impact-detail">{escape(score.reasoning)}</div>
                 </div>
-                """
+                """)
+            impact_html = "".join(impact_parts)
         else:
             impact_html = '<div class="no-impact">✅ No other repositories affected</div>'
         
         # Test cases HTML
-        tests_html = ""
-        for test in report.get_prioritized_tests()[:5]:
-            stars = '⭐' * test.priority
-            tests_html += f"""
+        test_parts = []
+        for test in report.get_top_tests(5):
+            stars = _STARS.get(test.priority)
+            if stars is None:
+                stars = '⭐' * test.priority
+            test_parts.append(f"""
             <div class="test-case">
                 <div class="test-header">
                     <span class="test-id">{test.test_id}</span>
                     <span class="test-type">{test.test_type}</span>
                     <span class="test-priority">{stars}</span>
                 </div>
-                <div class="test-description">{test.description}</div>
+                <div class="test-description">{escape(test.description)}</div>
             </div>
-            """
+            """)
+        tests_html = "".join(test_parts)
         
         # Deployment order HTML
         deployment_html = "".join(f'<div class="deployment-step">{i}. {repo}</div>' 
-                                  for i, repo in enumerate(report.deployment_order, 1))
+                                  for i, repo in enumerate(report.deployment_order, 1)) if report.deployment_order else ""
         
-        # Warnings HTML
-        warnings_html = "".join(f'<div class="warning-item">⚠️ {w}</div>' for w in report.warnings)
-        
-        # Recommendations HTML
-        recommendations_html = "".join(f'<div class="recommendation-item">📌 {r}</div>' 
-                                      for r in report.recommendations)
+        # Recommendations section (warnings first); omitted when there is nothing to say
+        if report.warnings or report.recommendations:
+            warnings_html = "".join(f'<div class="warning-item">⚠️ {escape(w)}</div>' for w in report.warnings)
+            recommendations_html = "".join(f'<div class="recommendation-item">📌 {escape(r)}</div>' 
+                                          for r in report.recommendations)
+            advice_html = f"""
+            <div class="section">
+                <h3>💡 Recommendations</h3>
+                {warnings_html}
+                {recommendations_html}
+            </div>"""
+        else:
+            advice_html = ""
         
         return f"""
         <div class="report-section">
@@ -119,12 +216,12 @@ class HTMLReportGenerator:
                 <h2>Report #{index}: {report.source_repository}</h2>
                 <div class="report-meta">
                     <span>Commit: <code>{report.source_commit[:8]}</code></span>
-                    <span>Time: {report.timestamp.strftime('%Y-%m-%d %H:%M')}</span>
+                    <span>Time: {report.timestamp.replace(tzinfo=None).isoformat(sep=' ', timespec='minutes')}</span>
                 </div>
             </div>
             
             <div class="change-summary">
-                <strong>Change:</strong> {report.change_summary[:150]}...
+                <strong>Change:</strong> {escape(report.change_summary[:150])}...
             </div>
             
             <div class="section">
@@ -141,25 +238,71 @@ class HTMLReportGenerator:
                 <h3>🚀 Deployment ({report.estimated_effort_hours}h effort)</h3>
                 <div class="deployment-order">{deployment_html}</div>
             </div>
-            
-            <div class="section">
-                <h3>💡 Recommendations</h3>
-                {warnings_html}
-                {recommendations_html}
-            </div>
+            {advice_html}
         </div>
         """
     
+    def _get_template_parts(self) -> List[str]:
+        """Split the template around its placeholders once per class (odd items are names)"""
+        return self._get_class_cached(
+            '_template_parts', lambda: _PLACEHOLDER_RE.split(self._get_html_template())
+        )
+    
+    def _get_bound_parts(self) -> List[str]:
+        """Template parts with {{LLM_MODEL}} folded into the surrounding static text"""
+        if self._bound_model != self.llm_model_name:
+            parts = self._get_template_parts()
+            bound = [parts[0]]
+            for i in range(1, len(parts), 2):
+                if parts[i] == "LLM_MODEL":
+                    bound[-1] += self.llm_model_name + parts[i + 1]
+                else:
+                    bound.extend((parts[i], parts[i + 1]))
+            self._bound_parts = bound
+            self._bound_model = self.llm_model_name
+        return self._bound_parts
+    
+    def _get_class_cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """Build a template-derived value once and share it across instances of this class"""
+        cls = type(self)
+        # Read the class's own __dict__ so subclasses with other templates don't inherit it
+        value = cls.__dict__.get(name)
+        if value is None:
+            value = build()
+            setattr(cls, name, value)
+        return value
+    
     def _get_html_template(self) -> str:
-        """Get HTML template with CSS"""
+        """Get HTML template (styles are filled in via {{STYLES}})"""
         return """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Multi-Repository Impact Analysis Report</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
+    {{STYLES}}
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🔍 Multi-Repository Impact Analysis</h1>
+            <div class="subtitle">Nutanix AI Agent Workshop</div>
+            <div class="meta">Generated: {{TIMESTAMP}} | LLM Model: <strong>{{LLM_MODEL}}</strong> | Analyzed: {{TOTAL_COMMITS}} commits</div>
+        </div>
+        {{SUMMARY}}
+        <div class="content">{{REPORTS}}</div>
+        <div class="footer">
+            <p><strong>Multi-Repository Dependency Impact Analysis System</strong></p>
+            <p>Powered by Nutanix AI (<strong>{{LLM_MODEL}}</strong>) | Generated automatically using AI agents</p>
+            <p style="margin-top: 10px; font-size: 0.9em;">This report analyzes code changes and their impact across the Nutanix ecosystem.<br><strong>Agents = Tools + LLM</strong></p>
+        </div>
+    </div>
+</body>
+</html>"""
+    
+    def _get_css(self) -> str:
+        """Get report stylesheet"""
+        return """        * { margin: 0; padding: 0; box-sizing: border-box; }
         body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; color: #333; }
         .container { max-width: 1200px; margin: 0 auto; background: white; border-radius: 16px; box-shadow: 0 20px 60px rgba(0,0,0,0.3); overflow: hidden; }
         .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px; text-align: center; }
@@ -205,23 +348,5 @@ class HTMLReportGenerator:
         .recommendation-item { background: #e8f5e9; border-left: 4px solid #4caf50; padding: 12px; margin-bottom: 10px; border-radius: 4px; }
         .footer { background: #f8f9fa; padding: 30px; text-align: center; color: #666; border-top: 2px solid #e0e0e0; }
         code { background: #f5f5f5; padding: 2px 6px; border-radius: 3px; font-family: 'Courier New', monospace; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🔍 Multi-Repository Impact Analysis</h1>
-            <div class="subtitle">Nutanix AI Agent Workshop</div>
-            <div class="meta">Generated: {{TIMESTAMP}} | LLM Model: <strong>{{LLM_MODEL}}</strong> | Analyzed: {{TOTAL_COMMITS}} commits</div>
-        </div>
-        {{SUMMARY}}
-        <div class="content">{{REPORTS}}</div>
-        <div class="footer">
-            <p><strong>Multi-Repository Dependency Impact Analysis System</strong></p>
-            <p>Powered by Nutanix AI (<strong>{{LLM_MODEL}}</strong>) | Generated automatically using AI agents</p>
-            <p style="margin-top: 10px; font-size: 0.9em;">This report analyzes code changes and their impact across the Nutanix ecosystem.<br><strong>Agents = Tools + LLM</strong></p>
-        </div>
-    </div>
-</body>
-</html>"""
+"""
 
@@ -1,50 +1,149 @@
 """LLM client for NAI endpoints"""
+import hashlib
+import logging
+import os
+import tempfile
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 
+_log = logging.getLogger(__name__)
+
 class NAIClient:
     """Client for Nutanix AI endpoints"""
     
-    def __init__(self, api_key: str, endpoint_url: str, model_name: str, max_tokens: int = 512):
+    # Only near-deterministic requests are served from the response cache
+    CACHE_MAX_TEMPERATURE = 0.2
+    # Fail fast on an unreachable endpoint, but give the model time to answer
+    CONNECT_TIMEOUT = 3.05
+    READ_TIMEOUT = 30
+    
+    def __init__(self, api_key: str, endpoint_url: str, model_name: str, max_tokens: int = 512,
+                 cache_dir: Optional[str] = None):
         self.api_key = api_key
         self.endpoint_url = endpoint_url
         self.model_name = model_name
         self.max_tokens = max_tokens
         self.headers = {"Authorization": f"Bearer {api_key}"}
+        # Fixed request fields; chat_completion copies this and fills the per-call ones.
+        # Key order matches the encoded body (and so the response cache keys)
+        self._base_payload = {
+            "model": model_name,
+            "messages": None,
+            "stream": False,
+            "max_tokens": max_tokens,
+            "temperature": None,
+        }
+        
+        # On-disk response cache keyed by request payload; disabled when no directory is given
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # One pooled keep-alive session for all calls, so each request after the
+        # first skips the TCP/TLS handshake. Connection failures and gateway/throttling
+        # statuses are retried with backoff; read timeouts and plain 500s are not, since
+        # the server may already have processed the (non-idempotent) completion
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.headers["Content-Type"] = "application/json"
+        self.session.verify = False
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                read=False,
+                backoff_factor=0.2,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["POST"],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def chat_completion(self, messages: List[Dict], 
                        tools: Optional[List[Dict]] = None,
                        temperature: float = 0.01,
-                       max_tokens: int = None) -> Dict:
-        """Make a chat completion request"""
-        payload = {
-            "model": self.model_name,
-            "messages": messages,
-            "stream": False,
-            "max_tokens": max_tokens or self.max_tokens,
-            "temperature": temperature,
-        }
-        
+                       max_tokens: int = None,
+                       cache: bool = True) -> Dict:
+        """Make a chat completion request (served from the response cache when enabled)"""
+        payload = self._base_payload.copy()
+        payload["messages"] = messages
+        payload["temperature"] = temperature
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
         if tools:
             payload["tools"] = tools
         
+        body = orjson.dumps(payload)
+        cache_path = None
+        if cache and self.cache_dir and temperature <= self.CACHE_MAX_TEMPERATURE:
+            key = hashlib.blake2b(self.endpoint_url.encode() + body, digest_size=16).hexdigest()
+            cache_path = os.path.join(self.cache_dir, f"{key}.json")
+            try:
+                with open(cache_path, 'rb') as f:
+                    return orjson.loads(f.read())
+            except (OSError, ValueError):
+                pass
+        
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.endpoint_url,
-                json=payload,
-                headers=self.headers,
-                verify=False,
-                timeout=30
+                data=body,
+                timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
             )
             response.raise_for_status()
-            return response.json()
+            result = orjson.loads(response.content)
+            if cache_path:
+                self._write_cache(cache_path, response.content)
+            return result
+        except requests.exceptions.ConnectTimeout as e:
+            _log.warning("LLM request failed: could not connect within %ss (%s)", self.CONNECT_TIMEOUT, e)
+        except requests.exceptions.ReadTimeout as e:
+            _log.warning("LLM request failed: no response within %ss (%s)", self.READ_TIMEOUT, e)
         except Exception as e:
-            print(f"Warning: LLM request failed: {e}")
-            return {"choices": [{"message": {"content": "Analysis unavailable", "role": "assistant"}}]}
+            _log.warning("LLM request failed: %s", e)
+        
+        return {"choices": [{"message": {"content": "Analysis unavailable", "role": "assistant"}}]}
+    
+    def _write_cache(self, cache_path: str, content: bytes):
+        """Store a response body atomically, so concurrent readers never see partial files"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            _log.warning("Could not cache LLM response: %s", e)
+    
+    def batch_chat_completion(self, message_lists: List[List[Dict]], max_workers: int = 8,
+                              **kwargs) -> List[Dict]:
+        """Run independent chat completions concurrently, returning responses in input order"""
+        if len(message_lists) < 2:
+            return [self.chat_completion(messages, **kwargs) for messages in message_lists]
+        
+        # Requests are network-bound and release the GIL while waiting, so threads
+        # overlap the round-trips; the session pool holds enough connections for them
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(message_lists))) as executor:
+            return list(executor.map(lambda messages: self.chat_completion(messages, **kwargs), message_lists))
     
     def extract_tool_calls(self, response: Dict) -> List[Dict]:
         """Extract tool calls from LLM response"""
@@ -61,6 +160,6 @@ class NAIClient:
         return {
             "role": "tool",
             "tool_call_id": tool_call_id,
-            "content": json.dumps(tool_result)
+            "content": orjson.dumps(tool_result).decode()
         }
 
@@ -1,235 +1,30 @@
 """
 Simple HTML report generator with clean table format
 """
-from typing import List, Dict
+import re
+from html import escape
+from itertools import islice
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from models.impact_report import ImpactReport
+from config import ANALYSIS_CONFIG, NAI_LLM_ENDPOINT_URL
 from datetime import datetime
 
-class SimpleHTMLReportGenerator:
-    """Generate simple, clean HTML reports with table format"""
-    
-    def __init__(self, llm_model_name: str, repositories: List[Dict], deployment_config: Dict = None):
-        self.llm_model_name = llm_model_name
-        self.repositories = repositories
-        self.deployment_config = deployment_config or {}
-    
-    def generate(self, reports: List[ImpactReport], output_path: str):
-        """Generate simple HTML report"""
-        
-        # Summary statistics
-        total_commits = len(reports)
-        date_range = self._get_date_range(reports)
-        
-        # Build header
-        header_html = self._generate_header()
-        
-        # Build summary
-        summary_html = self._generate_summary(total_commits, date_range)
-        
-        # Build repository connections table
-        connections_html = self._generate_connections_table()
-        
-        # Build main impact table
-        table_html = self._generate_impact_table(reports)
-        
-        # Fill template
-        html = self._get_html_template()
-        html = html.replace("{{HEADER}}", header_html)
-        html = html.replace("{{SUMMARY}}", summary_html)
-        html = html.replace("{{CONNECTIONS}}", connections_html)
-        html = html.replace("{{TABLE}}", table_html)
-        html = html.replace("{{TIMESTAMP}}", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        
-        # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print(f"✅ Simple HTML report generated: {output_path}")
-    
-    def _generate_header(self) -> str:
-        """Generate header with configuration details"""
-        from config import ANALYSIS_CONFIG, NAI_LLM_ENDPOINT_URL
-        
-        return f"""
-        <div class="header">
-            <h1>Multi-Repository Impact Analysis Report</h1>
-            <div class="config-details">
-                <div class="config-item"><strong>LLM Model:</strong> {self.llm_model_name}</div>
-                <div class="config-item"><strong>Endpoint:</strong> {NAI_LLM_ENDPOINT_URL}</div>
-                <div class="config-item"><strong>Max Tokens:</strong> {ANALYSIS_CONFIG.get('max_tokens', 4096)}</div>
-                <div class="config-item"><strong>Analysis Period:</strong> Last {ANALYSIS_CONFIG.get('days_to_analyze', 7)} days</div>
-                <div class="config-item"><strong>Repositories:</strong> {len(self.repositories)}</div>
-            </div>
-        </div>
-        """
-    
-    def _generate_summary(self, total_commits: int, date_range: str) -> str:
-        """Generate analysis summary"""
-        return f"""
-        <div class="summary">
-            <h2>Analysis Summary</h2>
-            <div class="summary-grid">
-                <div class="summary-item">
-                    <div class="label">Total Commits Analyzed</div>
-                    <div class="value">{total_commits}</div>
-                </div>
-                <div class="summary-item">
-                    <div class="label">Analysis Duration</div>
-                    <div class="value">{date_range}</div>
-                </div>
-                <div class="summary-item">
-                    <div class="label">Repositories</div>
-                    <div class="value">{len(self.repositories)}</div>
-                </div>
-            </div>
-        </div>
-        """
-    
-    def _generate_connections_table(self) -> str:
-        """Generate repository connections table"""
-        rows_html = ""
-        for repo in self.repositories:
-            repo_name = repo['name']
-            config = self.deployment_config.get(repo_name, {})
-            depends_on = ', '.join(config.get('depends_on', [])) or 'None'
-            
-            # Find dependents
-            dependents = [r for r, c in self.deployment_config.items() if repo_name in c.get('depends_on', [])]
-            dependents_str = ', '.join(dependents) or 'None'
-            
-            rows_html += f"""
-            <tr>
-                <td><strong>{repo_name}</strong></td>
-                <td>{depends_on}</td>
-                <td>{dependents_str}</td>
-                <td>{config.get('deployment_order', 'N/A')}</td>
-                <td>{config.get('deployment_method', 'N/A')}</td>
-                <td>{'Yes' if repo.get('user_facing', False) else 'No'}</td>
-            </tr>
-            """
-        
-        return f"""
-        <div class="connections-section">
-            <h2>Repository Connections & Dependencies</h2>
-            <table class="connections-table">
-                <thead>
-                    <tr>
-                        <th>Repository</th>
-                        <th>Depends On</th>
-                        <th>Used By</th>
-                        <th>Deploy Order</th>
-                        <th>Deploy Method</th>
-                        <th>User Facing</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {rows_html}
-                </tbody>
-            </table>
-        </div>
-        """
-    
-    def _generate_impact_table(self, reports: List[ImpactReport]) -> str:
-        """Generate main impact analysis table"""
-        
-        rows_html = ""
-        row_num = 0
-        
-        for report in reports:
-            if not report.impact_scores:
-                # No impact - single row
-                row_num += 1
-                rows_html += f"""
-                <tr>
-                    <td>{row_num}</td>
-                    <td><strong>{report.source_repository}</strong></td>
-                    <td><code>{report.source_commit[:8]}</code></td>
-                    <td>{report.change_summary[:80]}...</td>
-                    <td colspan="4" class="no-impact">No Cross-Repository Impact</td>
-                    <td>{len(report.changed_files)}</td>
-                </tr>
-                """
-            else:
-                # Has impacts - one row per impacted repo
-                for i, score in enumerate(report.impact_scores):
-                    row_num += 1
-                    
-                    # Get user flows
-                    flows = [f.flow_name for f in score.user_flows] if score.user_flows else []
-                    flows_str = ', '.join(flows) if flows else 'None'
-                    
-                    # Components
-                    components_str = ', '.join(score.affected_components[:3]) if score.affected_components else 'N/A'
-                    
-                    # Risk color
-                    risk_class = f"risk-{score.risk_level}"
-                    
-                    # Only show source info on first row
-                    if i == 0:
-                        rows_html += f"""
-                        <tr>
-                            <td rowspan="{len(report.impact_scores)}">{row_num}</td>
-                            <td rowspan="{len(report.impact_scores)}"><strong>{report.source_repository}</strong></td>
-                            <td rowspan="{len(report.impact_scores)}"><code>{report.source_commit[:8]}</code></td>
-                            <td rowspan="{len(report.impact_scores)}">{report.change_summary[:80]}...</td>
-                            <td><strong>{score.repository}</strong></td>
-                            <td>{components_str}</td>
-                            <td>{flows_str}</td>
-                            <td class="{risk_class}">{score.risk_level.upper()}</td>
-                            <td rowspan="{len(report.impact_scores)}">{len(report.changed_files)}</td>
-                        </tr>
-                        """
-                    else:
-                        rows_html += f"""
-                        <tr>
-                            <td><strong>{score.repository}</strong></td>
-                            <td>{components_str}</td>
-                            <td>{flows_str}</td>
-                            <td class="{risk_class}">{score.risk_level.upper()}</td>
-                        </tr>
-                        """
-        
-        return f"""
-        <div class="table-section">
-            <h2>Impact Analysis Details</h2>
-            <table class="impact-table">
-                <thead>
-                    <tr>
-                        <th>#</th>
-                        <th>Source Repository</th>
-                        <th>Commit</th>
-                        <th>Change Summary</th>
-                        <th>Impacted Repository</th>
-                        <th>Impacted Components</th>
-                        <th>Impacted User Workflows</th>
-                        <th>Risk Level</th>
-                        <th>Files Changed</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {rows_html}
-                </tbody>
-            </table>
-        </div>
-        """
-    
-    def _get_date_range(self, reports: List[ImpactReport]) -> str:
-        """Get date range of analyzed commits"""
-        if not reports:
-            return "N/A"
-        
-        dates = [r.timestamp for r in reports]
-        min_date = min(dates)
-        max_date = max(dates)
-        
-        if min_date.date() == max_date.date():
-            return min_date.strftime("%Y-%m-%d")
-        else:
-            return f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}"
-    
-    def _get_html_template(self) -> str:
-        """Get simple HTML template"""
-        return """<!DOCTYPE html>
+# Analysis settings shown in the report header
+_MAX_TOKENS = ANALYSIS_CONFIG.get('max_tokens', 4096)
+_DAYS_TO_ANALYZE = ANALYSIS_CONFIG.get('days_to_analyze', 7)
+
+# {{NAME}} placeholders in the report template
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Risk level -> CSS class and cell text, so impact rows do lookups instead of formatting
+_RISK_LEVELS = ('low', 'medium', 'high', 'critical')
+_RISK_CLASS = MappingProxyType({level: f"risk-{level}" for level in _RISK_LEVELS})
+_RISK_LABEL = MappingProxyType({level: level.upper() for level in _RISK_LEVELS})
+
+# Simple report template, filled via {{NAME}} placeholders
+_HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -435,3 +230,262 @@ class SimpleHTMLReportGenerator:
 </html>
         """
 
+class SimpleHTMLReportGenerator:
+    """Generate simple, clean HTML reports with table format"""
+    
+    def __init__(self, llm_model_name: str, repositories: List[Dict], deployment_config: Dict = None):
+        self.llm_model_name = llm_model_name
+        self.repositories = repositories
+        self.deployment_config = deployment_config or {}
+    
+    def generate(self, reports: List[ImpactReport], output_path: str, timestamp: Optional[str] = None):
+        """Generate simple HTML report (timestamp defaults to now)"""
+        
+        # Summary statistics
+        total_commits = len(reports)
+        date_range = self._get_date_range(reports)
+        
+        # Build header
+        header_html = self._generate_header()
+        
+        # Build summary
+        summary_html = self._generate_summary(total_commits, date_range)
+        
+        # Build repository connections table
+        connections_html = self._generate_connections_table()
+        
+        substitutions = {
+            "HEADER": header_html,
+            "SUMMARY": summary_html,
+            "CONNECTIONS": connections_html,
+            "TIMESTAMP": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        
+        # Stream the pre-split template straight to the file, no assembled document;
+        # the main impact table is written row by row as it is built
+        with open(output_path, 'w', encoding='utf-8', buffering=65536) as f:
+            for i, part in enumerate(self._get_template_parts()):
+                if not i % 2:
+                    f.write(part)
+                elif part == "TABLE":
+                    f.writelines(self._iter_impact_table(reports))
+                else:
+                    f.write(substitutions[part])
+        
+        print(f"✅ Simple HTML report generated: {output_path}")
+    
+    def generate_many(self, jobs: List[Tuple[List[ImpactReport], str]], max_workers: Optional[int] = None):
+        """Generate independent (reports, output_path) jobs, in worker processes for batches"""
+        # One generation time for the whole batch
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if len(jobs) < 2:
+            for reports, output_path in jobs:
+                self.generate(reports, output_path, timestamp)
+            return
+        
+        # Rendering is CPU-bound Python, so processes rather than threads
+        all_reports, output_paths = zip(*jobs)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.generate, all_reports, output_paths, [timestamp] * len(jobs)))
+    
+    def _get_template_parts(self) -> List[str]:
+        """Split the template around its placeholders once per class (odd items are names)"""
+        cls = type(self)
+        # Read the class's own __dict__ so subclasses with other templates don't inherit it
+        parts = cls.__dict__.get('_template_parts')
+        if parts is None:
+            parts = _PLACEHOLDER_RE.split(self._get_html_template())
+            cls._template_parts = parts
+        return parts
+    
+    def _generate_header(self) -> str:
+        """Generate header with configuration details"""
+        return f"""
+        <div class="header">
+            <h1>Multi-Repository Impact Analysis Report</h1>
+            <div class="config-details">
+                <div class="config-item"><strong>LLM Model:</strong> {self.llm_model_name}</div>
+                <div class="config-item"><strong>Endpoint:</strong> {NAI_LLM_ENDPOINT_URL}</div>
+                <div class="config-item"><strong>Max Tokens:</strong> {_MAX_TOKENS}</div>
+                <div class="config-item"><strong>Analysis Period:</strong> Last {_DAYS_TO_ANALYZE} days</div>
+                <div class="config-item"><strong>Repositories:</strong> {len(self.repositories)}</div>
+            </div>
+        </div>
+        """
+    
+    def _generate_summary(self, total_commits: int, date_range: str) -> str:
+        """Generate analysis summary"""
+        return f"""
+        <div class="summary">
+            <h2>Analysis Summary</h2>
+            <div class="summary-grid">
+                <div class="summary-item">
+                    <div class="label">Total Commits Analyzed</div>
+                    <div class="value">{total_commits}</div>
+                </div>
+                <div class="summary-item">
+                    <div class="label">Analysis Duration</div>
+                    <div class="value">{date_range}</div>
+                </div>
+                <div class="summary-item">
+                    <div class="label">Repositories</div>
+                    <div class="value">{len(self.repositories)}</div>
+                </div>
+            </div>
+        </div>
+        """
+    
+    def _generate_connections_table(self) -> str:
+        """Generate repository connections table"""
+        # Reverse dependency index (repo -> repos that depend on it), built in one pass
+        dependents_map: Dict[str, List[str]] = {}
+        for r, c in self.deployment_config.items():
+            for dep in set(c.get('depends_on', ())):
+                dependents_map.setdefault(dep, []).append(r)
+        
+        row_parts = []
+        for repo in self.repositories:
+            repo_name = repo['name']
+            config = self.deployment_config.get(repo_name, {})
+            depends_on = ', '.join(config.get('depends_on', ())) or 'None'
+            dependents_str = ', '.join(dependents_map.get(repo_name, ())) or 'None'
+            
+            row_parts.append(f"""
+            <tr>
+                <td><strong>{repo_name}</strong></td>
+                <td>{depends_on}</td>
+                <td>{dependents_str}</td>
+                <td>{config.get('deployment_order', 'N/A')}</td>
+                <td>{config.get('deployment_method', 'N/A')}</td>
+                <td>{'Yes' if repo.get('user_facing', False) else 'No'}</td>
+            </tr>
+            """)
+        rows_html = "".join(row_parts)
+        
+        return f"""
+        <div class="connections-section">
+            <h2>Repository Connections & Dependencies</h2>
+            <table class="connections-table">
+                <thead>
+                    <tr>
+                        <th>Repository</th>
+                        <th>Depends On</th>
+                        <th>Used By</th>
+                        <th>Deploy Order</th>
+                        <th>Deploy Method</th>
+                        <th>User Facing</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {rows_html}
+                </tbody>
+            </table>
+        </div>
+        """
+    
+    def _iter_impact_table(self, reports: List[ImpactReport]) -> Iterator[str]:
+        """Generate main impact analysis table, one row at a time"""
+        
+        yield """
+        <div class="table-section">
+            <h2>Impact Analysis Details</h2>
+            <table class="impact-table">
+                <thead>
+                    <tr>
+                        <th>#</th>
+                        <th>Source Repository</th>
+                        <th>Commit</th>
+                        <th>Change Summary</th>
+                        <th>Impacted Repository</th>
+                        <th>Impacted Components</th>
+                        <th>Impacted User Workflows</th>
+                        <th>Risk Level</th>
+                        <th>Files Changed</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    """
+        
+        row_num = 0
+        
+        for report in reports:
+            # Per-commit cells, computed once rather than for every impact row
+            source_repo = escape(report.source_repository)
+            commit = report.source_commit[:8]
+            summary = escape(report.change_summary[:80])
+            num_files = len(report.changed_files)
+            
+            if not report.impact_scores:
+                # No impact - single row
+                row_num += 1
+                yield f"""
+                <tr>
+                    <td>{row_num}</td>
+                    <td><strong>{source_repo}</strong></td>
+                    <td><code>{commit}</code></td>
+                    <td>{summary}...</td>
+                    <td colspan="4" class="no-impact">No Cross-Repository Impact</td>
+                    <td>{num_files}</td>
+                </tr>
+                """
+            else:
+                # Has impacts - one row per impacted repo; source info only on the first
+                scores = report.impact_scores
+                rowspan = len(scores)
+                row_num += 1
+                yield f"""
+                        <tr>
+                            <td rowspan="{rowspan}">{row_num}</td>
+                            <td rowspan="{rowspan}"><strong>{source_repo}</strong></td>
+                            <td rowspan="{rowspan}"><code>{commit}</code></td>
+                            <td rowspan="{rowspan}">{summary}...</td>{self._impact_cells(scores[0])}
+                            <td rowspan="{rowspan}">{num_files}</td>
+                        </tr>
+                        """
+                for score in islice(scores, 1, None):
+                    row_num += 1
+                    yield f"""
+                        <tr>{self._impact_cells(score)}
+                        </tr>
+                        """
+        
+        yield """
+                </tbody>
+            </table>
+        </div>
+        """
+    
+    def _impact_cells(self, score) -> str:
+        """Impacted repository, components, workflows and risk cells of one impact row"""
+        flows_str = escape(', '.join([f.flow_name for f in score.user_flows])) or 'None'
+        components_str = escape(', '.join(score.affected_components[:3])) or 'N/A'
+        risk_level = score.risk_level
+        
+        return f"""
+                            <td><strong>{escape(score.repository)}</strong></td>
+                            <td>{components_str}</td>
+                            <td>{flows_str}</td>
+                            <td class="{_RISK_CLASS[risk_level]}">{_RISK_LABEL[risk_level]}</td>"""
+    
+    def _get_date_range(self, reports: List[ImpactReport]) -> str:
+        """Get date range of analyzed commits"""
+        if not reports:
+            return "N/A"
+        
+        # Single pass for both ends, without building a list of timestamps
+        min_date = max_date = reports[0].timestamp
+        for r in reports:
+            timestamp = r.timestamp
+            if timestamp < min_date:
+                min_date = timestamp
+            elif timestamp > max_date:
+                max_date = timestamp
+        
+        if min_date.date() == max_date.date():
+            return min_date.strftime("%Y-%m-%d")
+        else:
+            return f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}"
+    
+    def _get_html_template(self) -> str:
+        """Get simple HTML template"""
+        return _HTML_TEMPLATE